@@ -1,44 +1,66 @@
-import json
+import argparse
+import bisect
 import logging
+import mmap
+import os
+import queue
+import sys
+import traceback
 from datetime import datetime
-from typing import Callable
-from functools import reduce
-from typing.io import TextIO
+from typing import BinaryIO, Callable, Union
 import time
-import ijson
+import multiprocessing
+from collections import Counter
+import numpy as np
 import objgraph
 
+# The yajl2_c backend is bundled with the binary ijson wheels (pip install ijson) and is
+# an order of magnitude faster than the pure Python parser that is used as a fallback
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    import ijson
+
+# orjson parses several times faster than the standard library and accepts bytes directly
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 """
 Logging
 """
 
 
-def initialise_global_logger():
+# Skip the thread / process lookups made for every LogRecord, the format doesn't use them
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+def initialise_global_logger(level: int = logging.INFO):
     logger = logging.getLogger()
-    file_handler = logging.FileHandler(filename="twitterHPC-" + str(datetime.now().strftime("%m.%d.%Y-%H:%M:%S"))
-                                                + '.log')
+    # Configure once per process, forked workers inherit the parent's handlers
+    if logger.handlers:
+        return
+    # delay=True only creates the file once a record is actually written
+    file_handler = logging.FileHandler(filename="twitterHPC-" + datetime.now().strftime("%Y%m%d-%H%M%S") +
+                                                "-" + str(os.getpid()) + '.log', delay=True)
     formatter = logging.Formatter('%(asctime)s %(levelname)-6s --- [%(name)-12s] %(message)s')
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
     logger.addHandler(stream_handler)
     logger.addHandler(file_handler)
-    file_handler.setLevel("INFO")
-    stream_handler.setLevel("INFO")
-    logger.setLevel("DEBUG")
-    # Make this func called exactly once
-    initialise_global_logger.__code__ = (lambda: None).__code__
+    file_handler.setLevel(level)
+    stream_handler.setLevel(level)
+    # Only this module's logger follows --debug, third party libraries stay at INFO
+    logger.setLevel(logging.INFO)
+    logging.getLogger("tw").setLevel(level)
 
 
-# Inherit this class to enable logging
-# Don't forget to Super call __init__ :
-#   super().__init__(Class)
-# Example Usage: self.logger.info()
-class Loggable:
-    def __init__(self, clazz):
-        initialise_global_logger()
-        self.logger = logging.getLogger(clazz.__name__)
-        # self.logger.addHandler(logging.NullHandler())
+# Shared by every class and function in this module
+log = logging.getLogger("tw")
 
 
 """
@@ -46,24 +68,20 @@ Map handling
 """
 
 
-class SentimentMap(Loggable):
+class SentimentMap:
     def __init__(self):
-        super().__init__(SentimentMap)
         self.map = {}
 
     def load_from_file(self, path_to_file: str):
         with open(path_to_file, mode='r') as f:
             self.load_from_string(f.read(), silent=True)
-            self.logger.info(self.load_from_file.__name__ + ": SentimentMap loaded from file " +
-                             f.name + ", rows=" + str(len(self.map)))
+            log.info("load_from_file: SentimentMap loaded from file %s, rows=%d", f.name, len(self.map))
         return self
 
     def load_from_string(self, data_str: str, silent: bool = False):
-        data = list(map(lambda x: x.split("\t"), data_str.split("\n")))
-        self.map = dict(data)
+        self.map = {k: int(v) for k, v in (row.split("\t") for row in data_str.split("\n") if row)}
         if not silent:
-            self.logger.info(self.load_from_file.__name__ + ": SentimentMap loaded from internal string"
-                             + ", rows=" + str(str(len(self.map))))
+            log.info("load_from_string: SentimentMap loaded from internal string, rows=%d", len(self.map))
         return self
 
     def __len__(self):
@@ -76,25 +94,99 @@ class SentimentMap(Loggable):
         return self.map
 
 
-class AreaMap(Loggable):
+class AreaMap:
     def __init__(self):
-        super().__init__(AreaMap)
         self.map = {}
+        self.x0 = 0.0
+        self.y0 = 0.0
+        self.dx = 1.0
+        self.dy = 1.0
+        self.nx = 0
+        self.ny = 0
+        self.uniform = False
+        # (xmin, xmax, ymin, ymax) of the whole grid, rejects everything until a map is loaded
+        self.bbox = (float("inf"), float("-inf"), float("inf"), float("-inf"))
+        self.ids = np.empty(0, dtype=object)
+        self.xmins = np.empty(0, dtype=np.float64)
+        self.xmaxs = np.empty(0, dtype=np.float64)
+        self.ymins = np.empty(0, dtype=np.float64)
+        self.ymaxs = np.empty(0, dtype=np.float64)
+        self.x_edges = np.empty(0, dtype=np.float64)
+        self.y_edges = np.empty(0, dtype=np.float64)
+        self.cell_index = np.empty(0, dtype=np.int64)
+        # Plain list copies of the above for the scalar lookup, which is faster without NumPy
+        self.x_edge_list = []
+        self.y_edge_list = []
+        self.cell_index_list = []
 
     def load_from_file(self, path_to_file: str):
-        with open(path_to_file, mode='r') as f:
+        with open(path_to_file, mode='rb') as f:
             self.load_from_string(f.read(), silent=True)
-            self.logger.info(self.load_from_file.__name__ + ": AreaMap loaded from file " +
-                             f.name + ", rows=" + str(len(self.map)))
+            log.info("load_from_file: AreaMap loaded from file %s, rows=%d", f.name, len(self.map))
         return self
 
-    def load_from_string(self, data_str: str, silent: bool = False):
-        json_data = json.loads(data_str)
+    def load_from_string(self, data_str: Union[str, bytes], silent: bool = False):
+        json_data = _json.loads(data_str)
         self.map = {row["properties"]["id"]: {k: v for k, v in row["properties"].items() if k != "id"} for row in
                     json_data["features"]}
+        self.build_arrays()
+        self.build_grid()
+        self.build_bins()
         if not silent:
-            self.logger.info(self.load_from_file.__name__ + ": AreaMap loaded from internal string"
-                             + ", rows=" + str(str(len(self.map))))
+            log.info("load_from_string: AreaMap loaded from internal string, rows=%d", len(self.map))
+        return self
+
+    # Cell bounds as parallel arrays, in the same order as self.map
+    def build_arrays(self):
+        cells = self.map.values()
+        self.ids = np.array(list(self.map), dtype=object)
+        self.xmins = np.fromiter((cell["xmin"] for cell in cells), dtype=np.float64, count=len(cells))
+        self.xmaxs = np.fromiter((cell["xmax"] for cell in cells), dtype=np.float64, count=len(cells))
+        self.ymins = np.fromiter((cell["ymin"] for cell in cells), dtype=np.float64, count=len(cells))
+        self.ymaxs = np.fromiter((cell["ymax"] for cell in cells), dtype=np.float64, count=len(cells))
+        if self.map:
+            self.bbox = (float(self.xmins.min()), float(self.xmaxs.max()),
+                         float(self.ymins.min()), float(self.ymaxs.max()))
+        return self
+
+    # On a uniform grid every cell can be addressed by its (column, row) index
+    def build_grid(self):
+        if not self.map:
+            return self
+        self.x0 = float(self.xmins.min())
+        self.y0 = float(self.ymins.min())
+        self.dx = float((self.xmaxs - self.xmins).max())
+        self.dy = float((self.ymaxs - self.ymins).max())
+        self.nx = round((self.xmaxs.max() - self.x0) / self.dx)
+        self.ny = round((self.ymaxs.max() - self.y0) / self.dy)
+        columns = (self.xmins - self.x0) / self.dx
+        rows = (self.ymins - self.y0) / self.dy
+        cells = set(zip(np.rint(columns).tolist(), np.rint(rows).tolist()))
+        self.uniform = bool(len(cells) == len(self.map) and
+                            np.allclose(self.xmaxs - self.xmins, self.dx) and
+                            np.allclose(self.ymaxs - self.ymins, self.dy) and
+                            np.allclose(columns, np.round(columns)) and np.allclose(rows, np.round(rows)))
+        return self
+
+    # Edges of every grid column / row, including those without any cell, and a flat
+    # (column, row) -> index into self.ids table with -1 for missing cells
+    def build_bins(self):
+        if not self.uniform:
+            return self
+        columns = np.rint((self.xmins - self.x0) / self.dx).astype(np.int64)
+        rows = np.rint((self.ymins - self.y0) / self.dy).astype(np.int64)
+        # Derived edges are replaced by the cells' own bounds, so points on an edge compare exactly
+        self.x_edges = self.x0 + np.arange(self.nx + 1) * self.dx
+        self.x_edges[columns] = self.xmins
+        self.x_edges[columns + 1] = self.xmaxs
+        self.y_edges = self.y0 + np.arange(self.ny + 1) * self.dy
+        self.y_edges[rows] = self.ymins
+        self.y_edges[rows + 1] = self.ymaxs
+        self.cell_index = np.full(self.nx * self.ny, -1, dtype=np.int64)
+        self.cell_index[columns * self.ny + rows] = np.arange(len(self.ids))
+        self.x_edge_list = self.x_edges.tolist()
+        self.y_edge_list = self.y_edges.tolist()
+        self.cell_index_list = self.cell_index.tolist()
         return self
 
     def __len__(self):
@@ -111,51 +203,63 @@ class AreaMap(Loggable):
 Data handling
 """
 
+# Trailing punctuation stripped from words before they are looked up in the SentimentMap
+PUNCTUATION = "!,?.’”"
+
+
+def normalise(word: str) -> str:
+    return word.lower().rstrip(PUNCTUATION)
+
+
+# Upper bound on the raw words remembered by TwitterPostFactory's word cache
+TOKEN_CACHE_SIZE = 200000
+
 
-class TwitterData(Loggable):
+class TwitterData:
     def __init__(self):
-        super().__init__(TwitterData)
         self.data = None
         self.len = 0
         self.offset = 0
         self.massive_file = None
+        self.massive_map = None
 
     def load_from_file(self, path_to_file: str):
-        with open(path_to_file, mode='r') as f:
-            self.data = self.load_from_string(f.read())
-        self.logger.info(self.load_from_file.__name__ + ": Data loaded from file " +
-                         path_to_file + ", rows=" + str(self.len) + ", offset=" + str(self.offset))
+        with open(path_to_file, mode='rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # orjson parses the mapped pages in place, the standard json module needs a bytes copy
+            with memoryview(mm) as view:
+                self.load_from_string(view if _json.__name__ == "orjson" else mm.read(), silent=True)
+        log.info("load_from_file: Data loaded from file %s, rows=%d, offset=%d", path_to_file, self.len, self.offset)
         return self
 
     def load_from_file_massive(self, path_to_file: str):
-        f = open(path_to_file, mode='r')
-        self.load_from_string_massive(f, silent=True)
-        self.logger.info(self.load_from_file.__name__ + ": Data loaded from massive file " +
-                         f.name + ", rows=" + str(self.len) + ", offset=" + str(self.offset))
+        f = self.massive_file = open(path_to_file, mode='rb')
+        self.massive_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.load_from_string_massive(self.massive_map, silent=True)
+        log.info("load_from_file_massive: Data loaded from massive file %s, rows=%d, offset=%d",
+                 f.name, self.len, self.offset)
         return self
 
-    def load_from_string(self, data_str: str, silent: bool = False):
-        json_data = json.loads(data_str)
-        self.data = list(map(lambda x: x["value"], json_data["rows"]))
+    def load_from_string(self, data_str: Union[str, bytes, memoryview], silent: bool = False):
+        json_data = _json.loads(data_str)
+        self.data = [row["value"] for row in json_data["rows"]]
         self.len = json_data["total_rows"]
         self.offset = json_data["offset"]
-        del json_data
-
         if not silent:
-            self.logger.info(self.load_from_file.__name__ + ": Data loaded from JSON string"
-                             + ", rows=" + str(self.len) + ", offset=" + str(self.offset))
+            log.info("load_from_string: Data loaded from JSON string, rows=%d, offset=%d", self.len, self.offset)
         return self
 
-    def load_from_string_massive(self, file: TextIO, silent: bool = False):
+    def load_from_string_massive(self, file: Union[BinaryIO, mmap.mmap], silent: bool = False):
         # self.len = list(ijson.items(file, "total_rows"))[0]
         # file.seek(0, 0)
-        self.data = ijson.items(file, "rows.item.value")
+        self.data = ijson.items(file, "rows.item.value", use_float=True)
         if not silent:
-            self.logger.info(self.load_from_file.__name__ + ": Data loaded from massive JSON string"
-                             + ", rows=" + str(self.len) + ", offset=" + str(self.offset))
+            log.info("load_from_string_massive: Data loaded from massive JSON string, rows=%d, offset=%d",
+                     self.len, self.offset)
         return self
 
     def close(self):
+        if self.massive_map:
+            self.massive_map.close()
         if self.massive_file:
             self.massive_file.close()
 
@@ -163,90 +267,259 @@ class TwitterData(Loggable):
         return self.len
 
 
-class TwitterPost(Loggable):
-    def __init__(self):
-        super().__init__(TwitterPost)
-        self.text = None
-        self.coordinates = None
-        self.area = None
-
-
-class TwitterPostFactory(Loggable):
-    def __init__(self, sentiment_reducer: Callable[[list, SentimentMap], int],
-                 area_mapper: Callable[[list, AreaMap], str], sentiment_map: SentimentMap, area_map: AreaMap):
-        super().__init__(TwitterPostFactory)
-        self.text_filters = []
-        self.text_mappers = []
+class TwitterPostFactory:
+    def __init__(self, area_mapper: Callable[[np.ndarray, AreaMap], np.ndarray], sentiment_map: SentimentMap,
+                 area_map: AreaMap):
         self.sentiment_map = sentiment_map
-        self.sentiment_reducer = sentiment_reducer
         self.area_map = area_map
         self.area_mapper = area_mapper
-
-    def produce(self, data: dict) -> (str, int):
-        twitter_post = TwitterPost()
-        twitter_post.text = data['properties']['text'].split(" ")
-        for func in self.text_mappers:
-            twitter_post.text = list(map(func, twitter_post.text))
-        for func in self.text_filters:
-            twitter_post.text = list(filter(func, twitter_post.text))
-        twitter_post.area = self.area_mapper(data['geometry']['coordinates'], self.area_map)
-        if not twitter_post.area:
-            return None, 0
-        twitter_post.score = self.sentiment_reducer(twitter_post.text, self.sentiment_map)
-        self.logger.debug(self.__init__.__name__ + ": Post parsed from data - {score = " + str(twitter_post.score) +
-                          ", text=" + str(twitter_post.text) + ", area = " + twitter_post.area + "}")
-        del data
-        return twitter_post.area, twitter_post.score
-
-    def add_text_filter(self, text_filter: Callable[[str], bool]):
-        self.text_filters.append(text_filter)
-
-    def add_text_mapper(self, text_mapper: Callable[[str], str]):
-        self.text_mappers.append(text_mapper)
+        # Words repeat heavily across posts, so each raw word is normalised and looked up once
+        self.token_cache = {}
+
+    # Resolves the areas of a whole chunk at once, returning only the posts inside the grid
+    def produce_batch(self, chunk: list) -> (np.ndarray, np.ndarray):
+        coordinates = np.asarray([data['geometry']['coordinates'] for data in chunk], dtype=np.float64)
+        areas = self.area_mapper(coordinates, self.area_map)
+        inside = np.flatnonzero(areas != "")
+        texts = [chunk[i]['properties']['text'] for i in inside]
+        return areas[inside], np.fromiter((self.score(text) for text in texts), dtype=np.int64, count=len(texts))
+
+    # Normalise, filter and score every word in a single pass, only unseen words are normalised
+    def score(self, text: str) -> int:
+        score = 0
+        token_cache = self.token_cache
+        for word in text.split(" "):
+            value = token_cache.get(word)
+            if value is None:
+                value = self.sentiment_map.map.get(normalise(word), 0)
+                if len(token_cache) < TOKEN_CACHE_SIZE:
+                    token_cache[word] = value
+            score += value
+        return score
+
+
+# Index into area_map.ids of the cell holding each point, -1 when there is none. Works on scalars and arrays.
+def locate_cells(x, y, area_map: AreaMap):
+    x_edges, y_edges = area_map.x_edges, area_map.y_edges
+    nx = len(x_edges) - 1
+    ny = len(y_edges) - 1
+    # A point on a shared edge lies in every cell touching it, searching from both sides finds all of them
+    columns = (np.clip(np.searchsorted(x_edges, x, side="left") - 1, 0, nx - 1),
+               np.clip(np.searchsorted(x_edges, x, side="right") - 1, 0, nx - 1))
+    rows = (np.clip(np.searchsorted(y_edges, y, side="left") - 1, 0, ny - 1),
+            np.clip(np.searchsorted(y_edges, y, side="right") - 1, 0, ny - 1))
+    # Like a scan over the map, the first matching cell in map order wins
+    missing = len(area_map.ids)
+    found = missing
+    for ix in columns:
+        for iy in rows:
+            cell = area_map.cell_index[ix * ny + iy]
+            found = np.minimum(found, np.where(cell < 0, missing, cell))
+    inside = (x >= x_edges[0]) & (x <= x_edges[nx]) & (y >= y_edges[0]) & (y <= y_edges[ny])
+    return np.where(inside & (found < missing), found, -1)
+
+
+# Scalar locate_cells for a point inside area_map.bbox, with the same tie-break on shared edges
+def locate_cell(x: float, y: float, area_map: AreaMap) -> int:
+    x_edges, y_edges = area_map.x_edge_list, area_map.y_edge_list
+    ny = len(y_edges) - 1
+    ix = min(bisect.bisect_right(x_edges, x), len(x_edges) - 1) - 1
+    iy = min(bisect.bisect_right(y_edges, y), ny) - 1
+    # A point on an inner edge also lies in the column / row before it
+    columns = (ix - 1, ix) if ix > 0 and x == x_edges[ix] else (ix,)
+    rows = (iy - 1, iy) if iy > 0 and y == y_edges[iy] else (iy,)
+    found = -1
+    for column in columns:
+        for row in rows:
+            cell = area_map.cell_index_list[column * ny + row]
+            if cell >= 0 and (found < 0 or cell < found):
+                found = cell
+    return found
 
 
 def area_mapper(coordinates: list, area_map: AreaMap) -> str:
-    potential_area = list(
-        filter(lambda x: x[1]["xmax"] >= coordinates[0] >= x[1]["xmin"] and x[1]["ymax"] >= coordinates[1] >=
-                         x[1]["ymin"],
-               list(area_map.map.items())))
-    if len(potential_area) > 0:
-        logging.getLogger("TwitterPostFactory").debug(
-            area_mapper.__name__ + ": area parsed from coordinates " + str(coordinates) + " -> " +
-            potential_area[0][0])
-        return potential_area[0][0]
-    else:
+    x, y = coordinates[0], coordinates[1]
+    bbox = area_map.bbox
+    # Most posts fall outside the grid, reject them before any per-cell work
+    if not (bbox[0] <= x <= bbox[1] and bbox[2] <= y <= bbox[3]):
         return ""
+    if area_map.uniform:
+        cell = locate_cell(x, y, area_map)
+        area_id = area_map.ids[cell] if cell >= 0 else ""
+    else:
+        # Any other layout falls back to testing every cell at once, the first match wins
+        mask = (x >= area_map.xmins) & (x <= area_map.xmaxs) & (y >= area_map.ymins) & (y <= area_map.ymaxs)
+        idx = mask.argmax()
+        area_id = area_map.ids[idx] if mask[idx] else ""
+    if area_id:
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("area_mapper: area parsed from coordinates %s -> %s", coordinates, area_id)
+    return area_id
+
+
+def area_mapper_batch(coordinates: np.ndarray, area_map: AreaMap) -> np.ndarray:
+    if not area_map.uniform:
+        return np.array([area_mapper(c, area_map) for c in coordinates.tolist()], dtype=object)
+    cells = locate_cells(coordinates[:, 0], coordinates[:, 1], area_map)
+    areas = np.full(len(coordinates), "", dtype=object)
+    areas[cells >= 0] = area_map.ids[cells[cells >= 0]]
+    return areas
+
+
+"""
+Batch processing
+"""
+
+CHUNK_SIZE = 1000
+
+
+# Group a stream of posts into lists of at most `size` posts
+def chunks(items, size: int = CHUNK_SIZE):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
-def sentiment_reducer(text: list, sentiment_map: SentimentMap) -> int:
-    n = 0
-    for i in text:
-        n += int(sentiment_map[i])
-    return n
+# Each worker process builds its own factory once, see init_worker
+worker_factory = None
+
+
+def init_worker(sentiment_path: str, area_path: str, level: int = logging.INFO):
+    global worker_factory
+    initialise_global_logger(level)
+    sentiment_map = SentimentMap().load_from_file(sentiment_path)
+    area_map = AreaMap().load_from_file(area_path)
+    worker_factory = TwitterPostFactory(area_mapper_batch, sentiment_map=sentiment_map, area_map=area_map)
+
+
+def process_chunk(chunk: list) -> dict:
+    areas, scores = worker_factory.produce_batch(chunk)
+    partial = {}
+    for k, v in zip(areas.tolist(), scores.tolist()):
+        partial[k] = partial.get(k, 0) + v
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("process_chunk: Chunk of %d posts scored - %s", len(chunk), partial)
+    return partial
+
+
+"""
+Pipeline
+"""
+
+# Chunks parsed ahead of the workers, bounds the memory held by the queue
+QUEUE_SIZE = 8
+
+
+# Seconds main waits on the results queue before checking on the children
+POLL_INTERVAL = 0.1
+
+
+# Logs the current exception and posts it to main, then exits non-zero so a failed child never leaves main waiting
+def report_failure(results: multiprocessing.Queue):
+    log.exception("%s: Failed", multiprocessing.current_process().name)
+    results.put(("error", multiprocessing.current_process().name + ": " + traceback.format_exc()))
+    sys.exit(1)
+
+
+# Streams the massive file in its own process so JSON parsing overlaps with scoring
+def parser_proc(path_to_file: str, tasks: multiprocessing.Queue, results: multiprocessing.Queue, workers: int,
+                level: int = logging.INFO):
+    try:
+        initialise_global_logger(level)
+        tw = TwitterData().load_from_file_massive(path_to_file)
+        try:
+            for chunk in chunks(tw.data):
+                tasks.put(chunk)
+        finally:
+            tw.close()
+    except Exception:
+        report_failure(results)
+    finally:
+        # One sentinel per worker
+        for _ in range(workers):
+            tasks.put(None)
+
+
+def worker_proc(sentiment_path: str, area_path: str, tasks: multiprocessing.Queue, results: multiprocessing.Queue,
+                level: int = logging.INFO):
+    try:
+        init_worker(sentiment_path, area_path, level)
+        result = Counter()
+        for chunk in iter(tasks.get, None):
+            result.update(process_chunk(chunk))
+        results.put(("result", result))
+    except Exception:
+        report_failure(results)
+
+
+# Sums the workers' partial results, raising as soon as any child reports an error or dies
+def collect_results(processes: list, results: multiprocessing.Queue, workers: int) -> Counter:
+    result = Counter()
+    received = 0
+    while received < workers or any(process.is_alive() for process in processes):
+        try:
+            kind, payload = results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            failed = [process for process in processes if process.exitcode]
+            if not failed:
+                continue
+            # The failed child's traceback can still be unread when its exit is noticed
+            while True:
+                try:
+                    kind, payload = results.get_nowait()
+                except queue.Empty:
+                    raise RuntimeError(failed[0].name + " exited with code " + str(failed[0].exitcode))
+                if kind == "error":
+                    raise RuntimeError(payload)
+        if kind == "error":
+            raise RuntimeError(payload)
+        result.update(payload)
+        received += 1
+    return result
 
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--debug", action="store_true", help="enable debug logging")
+    args = arg_parser.parse_args()
+    log_level = logging.DEBUG if args.debug else logging.INFO
+    initialise_global_logger(log_level)
     objgraph.show_growth()
     start = time.time()
-    tw = TwitterData().load_from_file_massive("bigTwitter.json")
-    sentiment = SentimentMap().load_from_file("AFINN.txt")
-    area = AreaMap().load_from_file("melbGrid.json")
-
-    factory = TwitterPostFactory(sentiment_reducer, area_mapper, sentiment_map=sentiment, area_map=area)
-    factory.add_text_mapper(lambda x: x.lower().rstrip("!,?.’”"))
-    factory.add_text_filter(lambda x: x in sentiment.map)
+    sentiment_path = "AFINN.txt"
+    area_path = "melbGrid.json"
+    area = AreaMap().load_from_file(area_path)
 
     logging.info(__name__ + ": Working...")
 
-    result = {k: 0 for k in area.map}
-    for item in tw.data:
-        k, v = factory.produce(item)
-        if k:
-            result[k] += v
+    # The parser process takes the remaining core
+    workers = max(multiprocessing.cpu_count() - 1, 1)
+    tasks = multiprocessing.Queue(maxsize=QUEUE_SIZE)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=parser_proc,
+                                         args=("bigTwitter.json", tasks, results, workers, log_level))]
+    processes += [multiprocessing.Process(target=worker_proc,
+                                          args=(sentiment_path, area_path, tasks, results, log_level))
+                  for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    result = Counter({k: 0 for k in area.map})
+    try:
+        result.update(collect_results(processes, results, workers))
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+    result = dict(result)
 
     logging.info(__name__ + ": Tasks done, time consumed = " + str(time.time() - start) + " seconds")
     logging.info(__name__ + ": Displaying result :" + str(result))
     print(__name__ + ": Displaying memory analysis :")
     objgraph.show_growth()
-    tw.close()
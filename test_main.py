@@ -0,0 +1,69 @@
+import json
+import unittest
+
+import numpy as np
+
+from main import AreaMap, area_mapper, area_mapper_batch
+
+# The 2021 melbGrid.json layout, id -> (xmin, xmax, ymin, ymax)
+MELB_GRID = {
+    "A1": (144.7, 144.85, -37.65, -37.5), "A2": (144.85, 145.0, -37.65, -37.5),
+    "A3": (145.0, 145.15, -37.65, -37.5), "A4": (145.15, 145.3, -37.65, -37.5),
+    "B1": (144.7, 144.85, -37.8, -37.65), "B2": (144.85, 145.0, -37.8, -37.65),
+    "B3": (145.0, 145.15, -37.8, -37.65), "B4": (145.15, 145.3, -37.8, -37.65),
+    "C1": (144.7, 144.85, -37.95, -37.8), "C2": (144.85, 145.0, -37.95, -37.8),
+    "C3": (145.0, 145.15, -37.95, -37.8), "C4": (145.15, 145.3, -37.95, -37.8),
+    "C5": (145.3, 145.45, -37.95, -37.8),
+    "D3": (145.0, 145.15, -38.1, -37.95), "D4": (145.15, 145.3, -38.1, -37.95),
+    "D5": (145.3, 145.45, -38.1, -37.95),
+}
+
+
+def melb_grid_json() -> str:
+    return json.dumps({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"id": k, "xmin": xmin, "xmax": xmax, "ymin": ymin, "ymax": ymax}}
+        for k, (xmin, xmax, ymin, ymax) in MELB_GRID.items()]})
+
+
+# The original lookup, the first cell in map order containing the point wins
+def scan(x: float, y: float) -> str:
+    for k, (xmin, xmax, ymin, ymax) in MELB_GRID.items():
+        if xmin <= x <= xmax and ymin <= y <= ymax:
+            return k
+    return ""
+
+
+class AreaMapperTest(unittest.TestCase):
+    def setUp(self):
+        self.area_map = AreaMap().load_from_string(melb_grid_json(), silent=True)
+        # Every cell edge, corner and centre, plus points just outside the grid
+        xs = sorted({v for cell in MELB_GRID.values() for v in cell[:2]})
+        ys = sorted({v for cell in MELB_GRID.values() for v in cell[2:]})
+        xs += [(a + b) / 2 for a, b in zip(xs, xs[1:])] + [xs[0] - 0.01, xs[-1] + 0.01]
+        ys += [(a + b) / 2 for a, b in zip(ys, ys[1:])] + [ys[0] - 0.01, ys[-1] + 0.01]
+        self.points = [[x, y] for x in xs for y in ys]
+
+    def test_grid_is_uniform(self):
+        self.assertTrue(self.area_map.uniform)
+
+    def test_area_mapper_matches_scan(self):
+        for x, y in self.points:
+            self.assertEqual(area_mapper([x, y], self.area_map), scan(x, y), (x, y))
+
+    def test_area_mapper_batch_matches_scan(self):
+        areas = area_mapper_batch(np.array(self.points), self.area_map).tolist()
+        self.assertEqual(areas, [scan(x, y) for x, y in self.points])
+
+    def test_shared_edges_go_to_the_first_cell(self):
+        self.assertEqual(area_mapper([144.85, -37.65], self.area_map), "A1")
+        self.assertEqual(area_mapper([145.0, -37.95], self.area_map), "C2")
+        self.assertEqual(area_mapper([145.3, -37.95], self.area_map), "C4")
+
+    def test_gaps_and_outside_map_to_nothing(self):
+        self.assertEqual(area_mapper([144.75, -38.0], self.area_map), "")
+        self.assertEqual(area_mapper([145.4, -37.6], self.area_map), "")
+        self.assertEqual(area_mapper([144.6, -37.7], self.area_map), "")
+
+
+if __name__ == "__main__":
+    unittest.main()